@@ -61,6 +61,9 @@ setup(
             "sphinx>=4.0.0",
             "sphinx-rtd-theme>=1.0.0",
         ],
+        "fast": [
+            "orjson>=3.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
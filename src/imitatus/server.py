@@ -1,9 +1,72 @@
 import json
+import secrets
+import socket
 import sys
+import threading
 import time
-import uuid
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; the stdlib json module is the fallback
+    orjson = None
+
+
+# The hot-path codec is bound once at import time. orjson.dumps is used
+# directly since its defaults already produce compact output. For the stdlib,
+# json.dumps constructs a new JSONEncoder on every call made with non-default
+# options, so the compact encoder is created once and reused.
+if orjson:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    _compact_encoder = json.JSONEncoder(separators=(',', ':'))
+
+    def _dumps(data):
+        """Serialize data to compact JSON bytes."""
+        return _compact_encoder.encode(data).encode()
+
+    _loads = json.loads
+
+
+def _dumps_pretty(data):
+    """Serialize data to JSON bytes indented by two spaces, for human readers."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+class RequestLogEntry:
+    """A single entry of the request log.
+
+    Uses __slots__ instead of a per-entry dict, which cuts the memory of each
+    logged request by more than half while keeping attribute access cheap.
+
+    Attributes:
+        timestamp (int): Time the request was received, in nanoseconds since the epoch
+        method (str): HTTP method
+        path (str): Raw request path including the query string
+        client_address (str): Client IP address
+    """
+
+    __slots__ = ('timestamp', 'method', 'path', 'client_address')
+
+    def __init__(self, timestamp, method, path, client_address):
+        self.timestamp = timestamp
+        self.method = method
+        self.path = path
+        self.client_address = client_address
+
+    def as_dict(self):
+        """Return the entry as a JSON-serializable dict."""
+        return {
+            'timestamp': self.timestamp,
+            'method': self.method,
+            'path': self.path,
+            'client_address': self.client_address
+        }
 
 
 class MockHTTPRequestHandler(BaseHTTPRequestHandler):
@@ -28,27 +91,129 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
 
     Attributes:
         active_tokens (dict): Maps authentication tokens to user data and metadata
-        items_db (dict): In-memory database storing items with their metadata
-        request_logs (list): Circular buffer of recent request data for monitoring
+        active_token_set (set): Token strings only, used for membership checks
+        items_shards (list): In-memory item database, split into dict shards by item ID
+        items_locks (list): One lock per item shard guarding its mutations
+        request_logs (deque): Ring buffer of the last REQUEST_LOG_SIZE RequestLogEntry items
 
     Example:
-        >>> from http.server import HTTPServer
-        >>> server = HTTPServer(('localhost', 8000), MockHTTPRequestHandler)
+        >>> server = MockHTTPServer(('localhost', 8000), MockHTTPRequestHandler)
         >>> server.serve_forever()
     """
 
-    # Class-level storage
-    active_tokens = {}
-    items_db = {}
-    request_logs = []
+    # Keep connections open between requests; every response carries an
+    # exact Content-Length, which HTTP/1.1 persistent connections require
+    protocol_version = 'HTTP/1.1'
+
+    # Close persistent connections that stay idle this many seconds, so
+    # abandoned clients do not hold a server thread forever
+    timeout = 60
 
-    def _set_headers(self, status_code=200, extra_headers=None):
-        """Set response headers with CORS support and content type configuration.
+    # Send small JSON replies immediately instead of waiting on Nagle's algorithm
+    disable_nagle_algorithm = True
 
-        Sets up standard headers for JSON responses and implements CORS policy.
-        Allows customization through extra headers for specific responses.
+    # 64KB read buffer instead of the 8KB default, so large request bodies
+    # are pulled off the socket in far fewer recv calls. wfile stays
+    # unbuffered: _send_raw already writes each response in one call, and
+    # the interim 100 Continue written by handle_expect_100 is never
+    # flushed, so a buffered wfile would hold it back until the final
+    # response.
+    rbufsize = 64 * 1024
+
+    # Class-level storage
+    active_tokens = {}
+    active_token_set = set()
+
+    # Number of most recent requests kept in the request_logs ring buffer
+    REQUEST_LOG_SIZE = 1024
+    request_logs = deque(maxlen=REQUEST_LOG_SIZE)
+
+    # Items are spread over independently locked shards so that concurrent
+    # requests touching different items rarely wait on each other
+    ITEM_SHARD_COUNT = 16
+    items_shards = [{} for _ in range(ITEM_SHARD_COUNT)]
+    items_locks = [threading.Lock() for _ in range(ITEM_SHARD_COUNT)]
+
+    # State of the GET /api/items listing: the collection version is bumped
+    # on every item mutation and serves as the ETag, and the encoded listing
+    # is cached until the next mutation. The per-process prefix keeps ETags
+    # from a previous server run from matching after a restart.
+    _items_listing = {'version': 0, 'body': None}
+    _items_listing_lock = threading.Lock()
+    _ETAG_PREFIX = secrets.token_hex(4)
+
+    # Headers shared by every response, encoded once at class creation
+    _STATIC_HEADER_BYTES = (
+        b"Content-Type: application/json\r\n"
+        b"Access-Control-Allow-Origin: *\r\n"
+        b"Access-Control-Allow-Methods: "
+        b"GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS, TRACE, CONNECT\r\n"
+        b"Access-Control-Allow-Headers: Content-Type, Authorization, X-Requested-With\r\n"
+    )
+
+    # Bodies of the most frequent error responses, serialized once so that
+    # failed requests skip dict construction and JSON encoding entirely
+    _ERR_NO_TOKEN = _dumps({"error": "No token provided"})
+    _ERR_BAD_TOKEN = _dumps({"error": "Invalid token"})
+    _ERR_ITEM_NOT_FOUND = _dumps({"error": "Item not found"})
+    _ERR_ENDPOINT_NOT_FOUND = _dumps({"error": "Endpoint not found"})
+    _ERR_INVALID_ENDPOINT = _dumps({"error": "Invalid endpoint"})
+    _ERR_BAD_CREDENTIALS = _dumps({"error": "Invalid credentials"})
+    _ERR_LOGIN_FIELDS = _dumps({"error": "Missing required fields: username and password"})
+    _ERR_BAD_JSON = _dumps({"error": "Invalid JSON format"})
+    _ERR_ITEM_FORMAT = _dumps({"error": "Invalid item format - expected object"})
+    _ERR_NOT_OBJECT = _dumps({"error": "Invalid request body - expected object"})
+    _ERR_BAD_CONTENT_LENGTH = _dumps({"error": "Invalid Content-Length header"})
+    _ERR_TOO_LARGE = _dumps({"error": "Request entity too large"})
+    _ERR_LENGTH_REQUIRED = _dumps({"error": "Content-Length required"})
+
+    # The OPTIONS body never changes, so it is serialized once up front
+    _ALLOWED_METHODS = 'GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS, TRACE, CONNECT'
+    _OPTIONS_BODY = _dumps({
+        "available_endpoints": [
+            "/api/login",
+            "/api/items",
+            "/api/items/{id}",
+            "/debug/vars"
+        ],
+        "supported_methods": _ALLOWED_METHODS.split(', ')
+    })
+
+    # Largest request body accepted; larger ones are rejected with 413 unread
+    MAX_BODY_SIZE = 5 * 1024 * 1024
+
+    # Size of each read when pulling a request body off the socket
+    _BODY_CHUNK_SIZE = 16 * 1024
+
+    # Exact-path routes, resolved with a single dict lookup per request
+    _ROUTES = {
+        ('POST', '/api/login'): '_handle_login',
+        ('POST', '/api/items'): '_handle_create_item',
+        ('GET', '/debug/vars'): '_handle_debug_vars',
+        ('GET', '/api/items'): '_handle_list_items',
+    }
+
+    # Handlers for /api/items/{id}, keyed by HTTP method
+    _ITEM_ROUTES = {
+        'GET': '_handle_get_item',
+        'PUT': '_handle_update_item',
+        'PATCH': '_handle_patch_item',
+        'DELETE': '_handle_delete_item',
+    }
+
+    _ITEM_PREFIX = '/api/items/'
+    _ITEM_PREFIX_LEN = len(_ITEM_PREFIX)
+
+    def _send_raw(self, body, status_code=200, extra_headers=None):
+        """Write a complete response with a single call to the output stream.
+
+        Joins the status line, per-response headers, the pre-encoded static
+        headers, Content-Length and the body into one bytes object instead of
+        going through send_response/send_header/end_headers, which buffer each
+        header separately and write the body with a second call.
 
         Args:
+            body (bytes): Encoded response body, empty for bodiless responses
             status_code (int, optional): HTTP status code for response. Defaults to 200.
             extra_headers (dict, optional): Additional headers to include. Defaults to None.
 
@@ -57,27 +222,85 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             - Content-Type: application/json
             - CORS headers for cross-origin requests
             - Access control headers for methods and headers
+            - Content-Length matching the body, except on 304 responses,
+              which must not advertise a length other than the full body's
+            - Connection: close when the request body was left unread
         """
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods',
-                         'GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS, TRACE, CONNECT')
-        self.send_header('Access-Control-Allow-Headers',
-                         'Content-Type, Authorization, X-Requested-With')
+        self._responded = True
+        self.log_request(status_code)
+        phrase = self.responses.get(status_code, ('',))[0]
+        parts = [
+            (
+                f"{self.protocol_version} {status_code} {phrase}\r\n"
+                f"Server: {self.version_string()}\r\n"
+                f"Date: {self.date_time_string(self._now // 1_000_000_000)}\r\n"
+            ).encode('latin-1', 'strict'),
+            self._STATIC_HEADER_BYTES,
+        ]
         if extra_headers:
-            for header, value in extra_headers.items():
-                self.send_header(header, value)
-        self.end_headers()
+            parts.append("".join(
+                f"{header}: {value}\r\n" for header, value in extra_headers.items()
+            ).encode('latin-1', 'strict'))
+        if not self._body_read and self._has_request_body():
+            # An unread request body would be parsed as the next request on
+            # a persistent connection, so close it after this response
+            self.close_connection = True
+            parts.append(b"Connection: close\r\n")
+        if status_code == 304:
+            parts.append(b"\r\n")
+        else:
+            parts.append(b"Content-Length: %d\r\n\r\n" % len(body))
+            parts.append(body)
+        # One join means one allocation and one copy of the body; the flush
+        # pushes it out even when wfile is buffered
+        self.wfile.write(b"".join(parts))
+        self.wfile.flush()
+
+    def _read_body(self, content_length):
+        """Read the request body straight into a preallocated buffer.
+
+        Fills a bytearray of the announced size through a memoryview in
+        fixed-size chunks, avoiding the intermediate bytes objects that
+        rfile.read() builds and joins for large bodies. Both json and orjson
+        parse a bytearray directly.
 
-    def _get_json_body(self):
+        Args:
+            content_length (int): Number of body bytes announced by the client
+
+        Returns:
+            bytearray: Body data, shorter than content_length if the client
+            closed the connection early
+        """
+        self._body_read = True
+        buf = bytearray(content_length)
+        offset = 0
+        with memoryview(buf) as view:
+            while offset < content_length:
+                read = self.rfile.readinto(view[offset:offset + self._BODY_CHUNK_SIZE])
+                if not read:
+                    break
+                offset += read
+        return buf if offset == content_length else buf[:offset]
+
+    def _has_request_body(self):
+        """Return True if the client announced a request body."""
+        return (self.headers.get('Content-Length', '0').strip() != '0'
+                or 'Transfer-Encoding' in self.headers)
+
+    def _get_json_body(self, not_object_body=None):
         """Parse and validate JSON request body with comprehensive error handling.
 
         Implements request body parsing with:
-        - Size limit enforcement (5MB)
+        - Size limit enforcement (MAX_BODY_SIZE), checked against the
+          Content-Length header before any body bytes are read
         - JSON format validation
+        - Rejection of valid JSON that is not an object
         - Error handling for malformed requests
 
+        Args:
+            not_object_body (bytes, optional): Pre-encoded error body sent when
+                the JSON is not an object. Defaults to _ERR_NOT_OBJECT.
+
         Returns:
             dict: Parsed JSON body if valid
             None: If parsing fails, after sending appropriate error response
@@ -85,25 +308,44 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         Note:
             Automatically sends error responses for:
             - Oversized requests (413)
-            - Malformed JSON (400)
-            - System errors (500)
+            - Bodies sent with Transfer-Encoding, which are not decoded (411)
+            - Invalid Content-Length header (400)
+            - Malformed or too deeply nested JSON (400)
+            - JSON values other than objects, including null (400)
+
+            Each try block wraps only the call that can fail with the caught
+            exception, so unexpected errors are not masked as client errors.
         """
+        if 'Transfer-Encoding' in self.headers:
+            # A chunked body would otherwise be left unread and parsed as {}
+            self._send_raw(self._ERR_LENGTH_REQUIRED, 411)
+            return None
         try:
             content_length = int(self.headers.get('Content-Length', 0))
-            if content_length > 1024 * 1024 * 5:  # 5MB limit
-                self._send_response({"error": "Request entity too large"}, 413)
-                return None
-            if content_length > 0:
-                try:
-                    body = self.rfile.read(content_length)
-                    return json.loads(body)
-                except json.JSONDecodeError:
-                    self._send_response({"error": "Invalid JSON format"}, 400)
-                    return None
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self._send_raw(self._ERR_BAD_CONTENT_LENGTH, 400)
+            return None
+        if content_length > self.MAX_BODY_SIZE:
+            self._send_raw(self._ERR_TOO_LARGE, 413)
+            return None
+        if content_length == 0:
             return {}
-        except Exception as e:
-            self._send_response({"error": str(e)}, 500)
+        body = self._read_body(content_length)
+        try:
+            body = _loads(body)
+        except (ValueError, RecursionError):
+            # ValueError covers both json and orjson decode errors; the stdlib
+            # decoder raises RecursionError on very deeply nested input
+            self._send_raw(self._ERR_BAD_JSON, 400)
+            return None
+        if not isinstance(body, dict):
+            # Callers treat None as "error already sent", so a JSON null must
+            # not slip through as a successfully parsed body
+            self._send_raw(not_object_body or self._ERR_NOT_OBJECT, 400)
             return None
+        return body
 
     def _send_response(self, data, status_code=200, extra_headers=None):
         """Send JSON response with proper headers and formatting.
@@ -114,18 +356,19 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             extra_headers (dict, optional): Additional headers. Defaults to None.
 
         Note:
-            Handles HEAD requests by not sending body content.
+            Bodies are emitted as compact JSON. Uses orjson for serialization
+            when it is installed, falling back to the standard library json
+            module otherwise. Bodiless responses such as HEAD go through
+            _send_raw directly.
         """
-        self._set_headers(status_code, extra_headers)
-        if data is not None:  # Don't send body for HEAD requests
-            self.wfile.write(json.dumps(data, indent=2).encode())
+        self._send_raw(_dumps(data), status_code, extra_headers)
 
     def _verify_token(self):
         """Verify authentication token from request headers.
 
         Implements token-based authentication:
         - Extracts Bearer token from Authorization header
-        - Validates token against active_tokens store
+        - Validates token against the active_token_set membership index
         - Handles missing or invalid tokens
 
         Returns:
@@ -138,14 +381,95 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         """
         auth_header = self.headers.get('Authorization', '')
         if not auth_header.startswith('Bearer '):
-            self._send_response({"error": "No token provided"}, 401)
+            self._send_raw(self._ERR_NO_TOKEN, 401)
             return False
-        token = auth_header.split(' ')[1]
-        if token not in self.active_tokens:
-            self._send_response({"error": "Invalid token"}, 401)
+        token = auth_header[7:]  # Slice past 'Bearer ' rather than splitting
+        if token not in self.active_token_set:
+            self._send_raw(self._ERR_BAD_TOKEN, 401)
             return False
         return True
 
+    def _shard(self, item_id):
+        """Locate the storage shard responsible for an item.
+
+        Args:
+            item_id (str): Item identifier
+
+        Returns:
+            tuple: (shard dict, shard lock) the item belongs to
+        """
+        index = hash(item_id) % self.ITEM_SHARD_COUNT
+        return self.items_shards[index], self.items_locks[index]
+
+    def _item_count(self):
+        """Return the total number of stored items across all shards."""
+        return sum(len(shard) for shard in self.items_shards)
+
+    def _all_items(self):
+        """Return a point-in-time snapshot of all items as a list.
+
+        Each shard is copied under its own lock, so the snapshot never observes
+        a shard in the middle of an update. Only the item dicts are returned;
+        their IDs are already part of each item.
+        """
+        items = []
+        for shard, lock in zip(self.items_shards, self.items_locks):
+            with lock:
+                items.extend(shard.values())
+        return items
+
+    def _recent_requests(self, count):
+        """Return the most recent request log entries, oldest first.
+
+        Indexes from the right end of the deque instead of copying it, which
+        keeps the cost independent of the buffer size and is safe while other
+        threads keep appending.
+
+        Args:
+            count (int): Maximum number of entries to return
+
+        Returns:
+            list: Up to count most recent log entries
+        """
+        logs = self.request_logs
+        return [logs[i] for i in range(-min(count, len(logs)), 0)]
+
+    def _items_changed(self):
+        """Bump the item collection version and drop the cached listing.
+
+        Called after every item mutation. In-place updates call it from a
+        finally block while still holding the shard lock, so the cached
+        listing is dropped even if the update fails partway.
+        """
+        with self._items_listing_lock:
+            self._items_listing['version'] += 1
+            self._items_listing['body'] = None
+
+    def _etag_matches(self, etag):
+        """Check whether the If-None-Match request header matches an ETag.
+
+        Uses the weak comparison If-None-Match requires, so a W/ prefix on
+        a listed tag is ignored.
+
+        Args:
+            etag (str): Quoted entity tag of the current representation
+
+        Returns:
+            bool: True if the client already holds this representation
+        """
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == etag:
+                return True
+        return False
+
     def _log_request(self):
         """Log request details for monitoring and debugging.
 
@@ -153,19 +477,291 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         - Timestamp
         - HTTP method
         - Request path
-        - Headers
         - Client IP address
 
-        Stores data in the request_logs list for later analysis.
+        Stores a RequestLogEntry in the request_logs ring buffer for later
+        analysis; the oldest entries are evicted once it is full. Headers are
+        not logged; use TRACE to inspect the headers of a request.
         """
-        request_data = {
-            'timestamp': time.time(),
-            'method': self.command,
-            'path': self.path,
-            'headers': dict(self.headers),
-            'client_address': self.client_address[0]
+        self.request_logs.append(RequestLogEntry(
+            self._now,
+            self.command,
+            self.path,
+            self.client_address[0]
+        ))
+
+    def parse_request(self):
+        """Parse the request line and headers, resetting per-request caches.
+
+        One handler instance serves every request on its connection, so
+        values memoized for the previous request are cleared here. The clock
+        is also read once at this point, as integer nanoseconds since the
+        epoch; every timestamp of the request (log entry, item metadata, Date
+        and X-Server-Time headers) reuses it.
+        """
+        self._now = time.time_ns()
+        self._path_and_query = None
+        self._body_read = False
+        self._responded = False
+        return super().parse_request()
+
+    @property
+    def path_and_query(self):
+        """tuple: (path, query string) of the request, split once per request."""
+        if self._path_and_query is None:
+            path, _, query = self.path.partition('?')
+            self._path_and_query = (path, query)
+        return self._path_and_query
+
+    def _dispatch(self, not_found_body):
+        """Route the request to its handler using the dispatch tables.
+
+        Uses the memoized path_and_query split instead of urlparse, looks
+        up exact paths in _ROUTES and falls back to _parse_item_path for
+        /api/items/{id}, so no intermediate lists are built while routing.
+
+        Args:
+            not_found_body (bytes): Pre-encoded error body sent with the 404
+                response when no route matches
+
+        Note:
+            A handler that returns without writing a response closes the
+            connection, so a keep-alive client is not left waiting for one
+            until the idle timeout.
+        """
+        path = self.path_and_query[0]
+        handler = self._ROUTES.get((self.command, path))
+        if handler is not None:
+            getattr(self, handler)()
+        else:
+            handler = self._ITEM_ROUTES.get(self.command)
+            item_id = None if handler is None else self._parse_item_path(path)
+            if item_id is not None:
+                getattr(self, handler)(item_id)
+            else:
+                self._send_raw(not_found_body, 404)
+        if not self._responded:
+            self.close_connection = True
+
+    def _parse_item_path(self, path):
+        """Extract the item ID from an /api/items/{id} path.
+
+        Uses a prefix check and a single slice rather than splitting the path,
+        so no list or sub-slices are allocated.
+
+        Args:
+            path (str): Request path without the query string
+
+        Returns:
+            str: The item ID if path has the form /api/items/{id}
+            None: For any other path, including nested paths below an item
+        """
+        if not path.startswith(self._ITEM_PREFIX):
+            return None
+        item_id = path[self._ITEM_PREFIX_LEN:]
+        if not item_id or '/' in item_id:
+            return None
+        return item_id
+
+    def _handle_login(self):
+        """Authenticate the user and issue a new token (POST /api/login)."""
+        body = self._get_json_body()
+        if body is None:  # Error already handled in _get_json_body
+            return
+
+        # Validate login request body
+        if not all(key in body for key in ['username', 'password']):
+            self._send_raw(self._ERR_LOGIN_FIELDS, 400)
+            return
+
+        # Check credentials
+        if body.get('username') == 'admin' and body.get('password') == 'password':
+            token = secrets.token_urlsafe(16)
+            user_id = secrets.token_urlsafe(16)
+            self.active_tokens[token] = {
+                'user_id': user_id,
+                'created_at': self._now
+            }
+            self.active_token_set.add(token)
+            self._send_response({
+                "token": token,
+                "user_id": user_id,
+                "message": "Login successful"
+            })
+        else:
+            self._send_raw(self._ERR_BAD_CREDENTIALS, 401)
+
+    def _handle_create_item(self):
+        """Create a new item from the request body (POST /api/items)."""
+        # Verify authentication first
+        if not self._verify_token():
+            return
+
+        # Get and validate request body
+        body = self._get_json_body(self._ERR_ITEM_FORMAT)
+        if body is None:  # Error already handled in _get_json_body
+            return
+
+        # Generate new item; the freshly parsed body is not shared, so it
+        # becomes the stored item directly instead of being copied
+        item_id = secrets.token_urlsafe(16)
+        item = body
+        item['id'] = item_id
+        item['created_at'] = self._now
+
+        # Store item
+        shard, lock = self._shard(item_id)
+        with lock:
+            shard[item_id] = item
+        self._items_changed()
+
+        # Send success response
+        self._send_response({
+            "id": item_id,
+            "item": item,
+            "message": "Item created successfully"
+        })
+
+    def _handle_debug_vars(self):
+        """Report server state and recent requests (GET /debug/vars).
+
+        Responds with indented JSON when the query string contains pretty=1;
+        every other response stays on the compact encoder.
+        """
+        state = {
+            "active_tokens_count": len(self.active_tokens),
+            "items_count": self._item_count(),
+            "recent_requests": [
+                entry.as_dict() for entry in self._recent_requests(5)
+            ]
         }
-        self.request_logs.append(request_data)
+        if parse_qs(self.path_and_query[1]).get('pretty') == ['1']:
+            self._send_raw(_dumps_pretty(state))
+        else:
+            self._send_response(state)
+
+    def _handle_list_items(self):
+        """Return all stored items (GET /api/items).
+
+        The response carries an ETag derived from the collection version.
+        A matching If-None-Match header is answered with 304 and no body,
+        and unchanged collections are served from the cached encoded listing
+        instead of being snapshotted and serialized again.
+        """
+        if not self._verify_token():
+            return
+        with self._items_listing_lock:
+            version = self._items_listing['version']
+            body = self._items_listing['body']
+        etag = f'"{self._ETAG_PREFIX}-{version}"'
+        if self._etag_matches(etag):
+            self._send_raw(b"", 304, {'ETag': etag})
+            return
+        if body is None:
+            body = _dumps({"items": self._all_items()})
+            with self._items_listing_lock:
+                if self._items_listing['version'] == version:
+                    self._items_listing['body'] = body
+        self._send_raw(body, extra_headers={'ETag': etag})
+
+    def _handle_get_item(self, item_id):
+        """Return a single item (GET /api/items/{id}).
+
+        Args:
+            item_id (str): Identifier taken from the request path
+        """
+        if not self._verify_token():
+            return
+        shard, lock = self._shard(item_id)
+        with lock:
+            item = shard.get(item_id)
+        if item is not None:
+            self._send_response({"item": item})
+        else:
+            self._send_raw(self._ERR_ITEM_NOT_FOUND, 404)
+
+    def _handle_update_item(self, item_id):
+        """Merge the request body into an existing item (PUT /api/items/{id}).
+
+        Args:
+            item_id (str): Identifier taken from the request path
+        """
+        if not self._verify_token():
+            return
+        # Merged in place below; _get_json_body rejects anything but an
+        # object before the stored item can be touched
+        body = self._get_json_body(self._ERR_ITEM_FORMAT)
+        if body is None:  # Error already handled in _get_json_body
+            return
+        shard, lock = self._shard(item_id)
+        with lock:
+            item = shard.get(item_id)
+            if item is not None:
+                try:
+                    item.update(body)
+                    item['updated_at'] = self._now
+                finally:
+                    self._items_changed()
+        if item is not None:
+            self._send_response({
+                "id": item_id,
+                "item": item,
+                "message": "Item updated successfully"
+            })
+        else:
+            self._send_raw(self._ERR_ITEM_NOT_FOUND, 404)
+
+    def _handle_patch_item(self, item_id):
+        """Update selected fields of an existing item (PATCH /api/items/{id}).
+
+        Args:
+            item_id (str): Identifier taken from the request path
+        """
+        if not self._verify_token():
+            return
+        # Merged in place below; _get_json_body rejects anything but an
+        # object before the stored item can be touched
+        body = self._get_json_body(self._ERR_ITEM_FORMAT)
+        if body is None:  # Error already handled in _get_json_body
+            return
+        shard, lock = self._shard(item_id)
+        with lock:
+            item = shard.get(item_id)
+            if item is not None:
+                try:
+                    item.update(body)
+                    item['patched_at'] = self._now
+                finally:
+                    self._items_changed()
+        if item is not None:
+            self._send_response({
+                "id": item_id,
+                "item": item,
+                "message": "Item patched successfully"
+            })
+        else:
+            self._send_raw(self._ERR_ITEM_NOT_FOUND, 404)
+
+    def _handle_delete_item(self, item_id):
+        """Remove an item from storage (DELETE /api/items/{id}).
+
+        Args:
+            item_id (str): Identifier taken from the request path
+        """
+        if not self._verify_token():
+            return
+        shard, lock = self._shard(item_id)
+        with lock:
+            deleted_item = shard.pop(item_id, None)
+        if deleted_item is not None:
+            self._items_changed()
+            self._send_response({
+                "id": item_id,
+                "item": deleted_item,
+                "message": "Item deleted successfully"
+            })
+        else:
+            self._send_raw(self._ERR_ITEM_NOT_FOUND, 404)
 
     def do_POST(self):
         """Handle POST requests for authentication and resource creation.
@@ -184,78 +780,7 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         """
         try:
             self._log_request()
-            parsed_path = urlparse(self.path)
-
-            if parsed_path.path == '/api/login':
-                body = self._get_json_body()
-                if body is None:  # Error already handled in _get_json_body
-                    return
-
-                # Validate login request body
-                if not all(key in body for key in ['username', 'password']):
-                    self._send_response({
-                        "error": "Missing required fields: username and password"
-                    }, 400)
-                    return
-
-                # Check credentials
-                if body.get('username') == 'admin' and body.get('password') == 'password':
-                    token = str(uuid.uuid4())
-                    user_id = str(uuid.uuid4())
-                    self.active_tokens[token] = {
-                        'user_id': user_id,
-                        'created_at': time.time()
-                    }
-                    self._send_response({
-                        "token": token,
-                        "user_id": user_id,
-                        "message": "Login successful"
-                    })
-                else:
-                    self._send_response({
-                        "error": "Invalid credentials"
-                    }, 401)
-
-            elif parsed_path.path == '/api/items':
-                # Verify authentication first
-                if not self._verify_token():
-                    return
-
-                # Get and validate request body
-                body = self._get_json_body()
-                if body is None:  # Error already handled in _get_json_body
-                    return
-
-                # Validate item data
-                if not isinstance(body, dict):
-                    self._send_response({
-                        "error": "Invalid item format - expected object"
-                    }, 400)
-                    return
-
-                # Generate new item
-                item_id = str(uuid.uuid4())
-                item = {
-                    'id': item_id,
-                    'created_at': time.time(),
-                    **body
-                }
-
-                # Store item
-                self.items_db[item_id] = item
-
-                # Send success response
-                self._send_response({
-                    "id": item_id,
-                    "item": item,
-                    "message": "Item created successfully"
-                })
-
-            else:
-                self._send_response({
-                    "error": "Endpoint not found"
-                }, 404)
-
+            self._dispatch(self._ERR_ENDPOINT_NOT_FOUND)
         except Exception as e:
             # Log the error (in a real server, you'd use proper logging)
             print(f"Server error in do_POST: {str(e)}", file=sys.stderr)
@@ -282,30 +807,7 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             Returns 404 for non-existent items/endpoints.
         """
         self._log_request()
-        parsed_path = urlparse(self.path)
-
-        if parsed_path.path == '/debug/vars':
-            # Special endpoint to view server state
-            self._send_response({
-                "active_tokens_count": len(self.active_tokens),
-                "items_count": len(self.items_db),
-                "recent_requests": self.request_logs[-5:]
-            })
-            return
-
-        if parsed_path.path.startswith('/api/items'):
-            if not self._verify_token():
-                return
-
-            parts = parsed_path.path.split('/')
-            if len(parts) == 3:  # /api/items
-                self._send_response({"items": self.items_db})
-            elif len(parts) == 4:  # /api/items/{id}
-                item_id = parts[3]
-                if item_id in self.items_db:
-                    self._send_response({"item": self.items_db[item_id]})
-                else:
-                    self._send_response({"error": "Item not found"}, 404)
+        self._dispatch(self._ERR_ENDPOINT_NOT_FOUND)
 
     def do_PUT(self):
         """Handle PUT requests for full resource updates.
@@ -322,28 +824,7 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             - Preserves item ID and creation timestamp
         """
         self._log_request()
-        if not self._verify_token():
-            return
-
-        parts = self.path.split('/')
-        if len(parts) == 4 and parts[1:3] == ['api', 'items']:
-            item_id = parts[3]
-            if item_id in self.items_db:
-                body = self._get_json_body()
-                self.items_db[item_id] = {
-                    **self.items_db[item_id],
-                    **body,
-                    'updated_at': time.time()
-                }
-                self._send_response({
-                    "id": item_id,
-                    "item": self.items_db[item_id],
-                    "message": "Item updated successfully"
-                })
-            else:
-                self._send_response({"error": "Item not found"}, 404)
-        else:
-            self._send_response({"error": "Invalid endpoint"}, 404)
+        self._dispatch(self._ERR_INVALID_ENDPOINT)
 
     def do_PATCH(self):
         """Handle PATCH requests for partial resource updates.
@@ -361,27 +842,7 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             - Adds patch timestamp to item metadata
         """
         self._log_request()
-        if not self._verify_token():
-            return
-
-        parts = self.path.split('/')
-        if len(parts) == 4 and parts[1:3] == ['api', 'items']:
-            item_id = parts[3]
-            if item_id in self.items_db:
-                body = self._get_json_body()
-                self.items_db[item_id].update({
-                    **body,
-                    'patched_at': time.time()
-                })
-                self._send_response({
-                    "id": item_id,
-                    "item": self.items_db[item_id],
-                    "message": "Item patched successfully"
-                })
-            else:
-                self._send_response({"error": "Item not found"}, 404)
-        else:
-            self._send_response({"error": "Invalid endpoint"}, 404)
+        self._dispatch(self._ERR_INVALID_ENDPOINT)
 
     def do_DELETE(self):
         """Handle DELETE requests for resource removal.
@@ -398,23 +859,7 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             - Operation is permanent and cannot be undone
         """
         self._log_request()
-        if not self._verify_token():
-            return
-
-        parts = self.path.split('/')
-        if len(parts) == 4 and parts[1:3] == ['api', 'items']:
-            item_id = parts[3]
-            if item_id in self.items_db:
-                deleted_item = self.items_db.pop(item_id)
-                self._send_response({
-                    "id": item_id,
-                    "item": deleted_item,
-                    "message": "Item deleted successfully"
-                })
-            else:
-                self._send_response({"error": "Item not found"}, 404)
-        else:
-            self._send_response({"error": "Invalid endpoint"}, 404)
+        self._dispatch(self._ERR_INVALID_ENDPOINT)
 
     def do_HEAD(self):
         """Handle HEAD requests for resource metadata.
@@ -424,15 +869,16 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         - X-Active-Tokens: Count of active authentication tokens
 
         Note:
-            Response includes headers only, no body content.
+            Response includes headers only, no body content. It is written
+            directly with Content-Length: 0, bypassing JSON serialization.
         """
         self._log_request()
         # Similar to GET but without body
         extra_headers = {
-            'X-Total-Items': str(len(self.items_db)),
+            'X-Total-Items': str(self._item_count()),
             'X-Active-Tokens': str(len(self.active_tokens))
         }
-        self._send_response(None, extra_headers=extra_headers)
+        self._send_raw(b"", extra_headers=extra_headers)
 
     def do_OPTIONS(self):
         """Handle OPTIONS requests for API capabilities discovery.
@@ -444,23 +890,15 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         - API version information
 
         Note:
-            Used for CORS preflight and API discovery.
+            Used for CORS preflight and API discovery. Only the X-Server-Time
+            header is computed per request; the body is cached as bytes.
         """
         self._log_request()
-        extra_headers = {
-            'Allow': 'GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS, TRACE, CONNECT',
+        self._send_raw(self._OPTIONS_BODY, extra_headers={
+            'Allow': self._ALLOWED_METHODS,
             'X-API-Version': '1.0',
-            'X-Server-Time': str(time.time())
-        }
-        self._send_response({
-            "available_endpoints": [
-                "/api/login",
-                "/api/items",
-                "/api/items/{id}",
-                "/debug/vars"
-            ],
-            "supported_methods": extra_headers['Allow'].split(', ')
-        }, extra_headers=extra_headers)
+            'X-Server-Time': str(self._now)
+        })
 
     def do_TRACE(self):
         """Handle TRACE requests for request debugging.
@@ -479,7 +917,7 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
         self._log_request()
         # Echo back the request details
         request_details = {
-            'headers': dict(self.headers),
+            'headers': dict(self.headers.items()),
             'method': self.command,
             'path': self.path,
             'protocol_version': self.protocol_version,
@@ -512,6 +950,39 @@ class MockHTTPRequestHandler(BaseHTTPRequestHandler):
             }, 400)
 
 
+class MockHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server with socket options tuned for the mock API.
+
+    Serves each connection on its own daemon thread and enlarges the send
+    buffer of the listening socket, which accepted connections inherit, so
+    larger JSON responses leave in fewer send calls. The listen backlog is
+    raised to the system maximum so bursts of new connections queue in the
+    kernel instead of being refused.
+
+    Attributes:
+        request_queue_size (int): Listen backlog passed to socket.listen()
+        send_buffer_size (int): SO_SNDBUF value requested for the socket
+        reuse_port (bool): Set SO_REUSEPORT so several servers can share the
+            port. Off by default because each process keeps its own tokens
+            and items, so a client spread across processes sees
+            inconsistent state.
+        debug (bool): Include exception details in 500 responses
+    """
+
+    daemon_threads = True
+    debug = False
+    request_queue_size = socket.SOMAXCONN
+    send_buffer_size = 1 << 20
+    reuse_port = False
+
+    def server_bind(self):
+        """Apply socket options before binding the listening socket."""
+        if self.reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        super().server_bind()
+
+
 def run_server(port=8000):
     """Start the mock HTTP server on the specified port.
 
@@ -521,9 +992,11 @@ def run_server(port=8000):
     Note:
         Can be interrupted with Ctrl+C (KeyboardInterrupt)
         Binds to all available network interfaces ('')
+        Each connection is served on its own daemon thread, so a slow client
+        does not block other requests
     """
     server_address = ('', port)
-    httpd = HTTPServer(server_address, MockHTTPRequestHandler)
+    httpd = MockHTTPServer(server_address, MockHTTPRequestHandler)
     print(f"Starting mock HTTP server on port {port}")
     print(f"Server is ready to accept requests...")
     try:
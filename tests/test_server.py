@@ -1,17 +1,18 @@
 import pytest
 import requests
+import contextlib
+import http.client
 import json
 import threading
 import time
-from http.server import HTTPServer
-from imitatus.server import MockHTTPRequestHandler
+from imitatus.server import MockHTTPRequestHandler, MockHTTPServer
 
 
 class TestImitatus:
     @classmethod
     def setup_class(cls):
         """Setup test server in a separate thread before running tests"""
-        cls.server = HTTPServer(('localhost', 0), MockHTTPRequestHandler)
+        cls.server = MockHTTPServer(('localhost', 0), MockHTTPRequestHandler)
         cls.server_thread = threading.Thread(target=cls.server.serve_forever)
         cls.server_thread.daemon = True
         cls.server_thread.start()
@@ -20,6 +21,9 @@ class TestImitatus:
         cls.port = cls.server.server_port
         cls.base_url = f'http://localhost:{cls.port}'
 
+        # One session for all tests so requests reuse a persistent connection
+        cls.session = requests.Session()
+
         # Store common headers and test data
         cls.headers = {'Content-Type': 'application/json'}
         cls.test_item = {
@@ -31,6 +35,7 @@ class TestImitatus:
     @classmethod
     def teardown_class(cls):
         """Cleanup after all tests are done"""
+        cls.session.close()
         cls.server.shutdown()
         cls.server.server_close()
         cls.server_thread.join()
@@ -39,7 +44,7 @@ class TestImitatus:
         """Setup before each test method"""
         # Login and get token
         login_data = {'username': 'admin', 'password': 'password'}
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/login',
             headers=self.headers,
             json=login_data
@@ -51,10 +56,19 @@ class TestImitatus:
             'Authorization': f'Bearer {self.token}'
         }
 
+    @contextlib.contextmanager
+    def raw_connection(self):
+        """Open a bare http.client connection to the server, closed on exit"""
+        conn = http.client.HTTPConnection('localhost', self.port)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
     def test_login_success(self):
         """Test successful login"""
         login_data = {'username': 'admin', 'password': 'password'}
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/login',
             headers=self.headers,
             json=login_data
@@ -68,7 +82,7 @@ class TestImitatus:
     def test_login_failure(self):
         """Test login with invalid credentials"""
         login_data = {'username': 'wrong', 'password': 'wrong'}
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/login',
             headers=self.headers,
             json=login_data
@@ -78,7 +92,7 @@ class TestImitatus:
 
     def test_create_item(self):
         """Test creating a new item"""
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/items',
             headers=self.auth_headers,
             json=self.test_item
@@ -87,27 +101,82 @@ class TestImitatus:
         data = response.json()
         assert 'id' in data
         assert data['item']['name'] == self.test_item['name']
+        assert isinstance(data['item']['created_at'], int)
         self.item_id = data['id']  # Store it as instance variable
         return self.item_id  # Return for tests that need it immediately
 
+    def test_create_item_ignores_client_id(self):
+        """Test that server-assigned fields win over the request body"""
+        response = self.session.post(
+            f'{self.base_url}/api/items',
+            headers=self.auth_headers,
+            json={**self.test_item, 'id': 'client-chosen'}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data['item']['id'] == data['id'] != 'client-chosen'
+
+        response = self.session.get(
+            f'{self.base_url}/api/items/{data["id"]}',
+            headers=self.auth_headers
+        )
+        assert response.status_code == 200
+
     def test_get_items(self):
         """Test getting all items"""
         # Create an item first
         self.test_create_item()
 
-        response = requests.get(
+        response = self.session.get(
             f'{self.base_url}/api/items',
             headers=self.auth_headers
         )
         assert response.status_code == 200
         data = response.json()
         assert 'items' in data
+        assert isinstance(data['items'], list)
         assert len(data['items']) > 0
+        assert all('id' in item for item in data['items'])
+
+    def test_get_items_etag(self):
+        """Test conditional listing of items with ETag/If-None-Match"""
+        self.test_create_item()
+        response = self.session.get(
+            f'{self.base_url}/api/items',
+            headers=self.auth_headers
+        )
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        # Unchanged collection is not sent again
+        response = self.session.get(
+            f'{self.base_url}/api/items',
+            headers={**self.auth_headers, 'If-None-Match': etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b''
+        assert 'Content-Length' not in response.headers
+
+        # If-None-Match uses weak comparison
+        response = self.session.get(
+            f'{self.base_url}/api/items',
+            headers={**self.auth_headers, 'If-None-Match': f'W/{etag}'}
+        )
+        assert response.status_code == 304
+
+        # Any mutation invalidates the ETag
+        self.test_create_item()
+        response = self.session.get(
+            f'{self.base_url}/api/items',
+            headers={**self.auth_headers, 'If-None-Match': etag}
+        )
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
 
     def test_get_specific_item(self):
         """Test getting a specific item"""
         item_id = self.test_create_item()
-        response = requests.get(
+        response = self.session.get(
             f'{self.base_url}/api/items/{item_id}',
             headers=self.auth_headers
         )
@@ -123,7 +192,7 @@ class TestImitatus:
             'name': 'Updated Item',
             'price': 39.99
         }
-        response = requests.put(
+        response = self.session.put(
             f'{self.base_url}/api/items/{item_id}',
             headers=self.auth_headers,
             json=updated_data
@@ -137,7 +206,7 @@ class TestImitatus:
         """Test partially updating an item"""
         item_id = self.test_create_item()
         patch_data = {'price': 44.99}
-        response = requests.patch(
+        response = self.session.patch(
             f'{self.base_url}/api/items/{item_id}',
             headers=self.auth_headers,
             json=patch_data
@@ -148,17 +217,39 @@ class TestImitatus:
         # Original name should remain unchanged
         assert data['item']['name'] == self.test_item['name']
 
+    def test_update_item_rejects_non_object(self):
+        """Test that PUT/PATCH bodies other than objects leave the item untouched"""
+        item_id = self.test_create_item()
+        for method in ('put', 'patch'):
+            for body in ([['zz', 1]], [['name', 'HACKED'], 5]):
+                response = self.session.request(
+                    method,
+                    f'{self.base_url}/api/items/{item_id}',
+                    headers=self.auth_headers,
+                    json=body
+                )
+                assert response.status_code == 400
+                assert response.json()['error'] == 'Invalid item format - expected object'
+
+        response = self.session.get(
+            f'{self.base_url}/api/items/{item_id}',
+            headers=self.auth_headers
+        )
+        item = response.json()['item']
+        assert item['name'] == self.test_item['name']
+        assert 'zz' not in item
+
     def test_delete_item(self):
         """Test deleting an item"""
         item_id = self.test_create_item()
-        response = requests.delete(
+        response = self.session.delete(
             f'{self.base_url}/api/items/{item_id}',
             headers=self.auth_headers
         )
         assert response.status_code == 200
 
         # Verify item is deleted
-        response = requests.get(
+        response = self.session.get(
             f'{self.base_url}/api/items/{item_id}',
             headers=self.auth_headers
         )
@@ -166,7 +257,7 @@ class TestImitatus:
 
     def test_head_request(self):
         """Test HEAD request"""
-        response = requests.head(
+        response = self.session.head(
             f'{self.base_url}/api/items',
             headers=self.auth_headers
         )
@@ -176,7 +267,7 @@ class TestImitatus:
 
     def test_options_request(self):
         """Test OPTIONS request"""
-        response = requests.options(
+        response = self.session.options(
             f'{self.base_url}/api/items',
             headers=self.auth_headers
         )
@@ -188,7 +279,7 @@ class TestImitatus:
 
     def test_trace_request(self):
         """Test TRACE request"""
-        response = requests.request(
+        response = self.session.request(
             'TRACE',
             f'{self.base_url}/api/items',
             headers=self.auth_headers
@@ -201,7 +292,7 @@ class TestImitatus:
 
     def test_unauthorized_access(self):
         """Test accessing protected endpoints without token"""
-        response = requests.get(
+        response = self.session.get(
             f'{self.base_url}/api/items',
             headers=self.headers  # No auth token
         )
@@ -214,7 +305,7 @@ class TestImitatus:
             **self.headers,
             'Authorization': 'Bearer invalid-token'
         }
-        response = requests.get(
+        response = self.session.get(
             f'{self.base_url}/api/items',
             headers=invalid_headers
         )
@@ -223,7 +314,7 @@ class TestImitatus:
 
     def test_debug_vars(self):
         """Test debug endpoint"""
-        response = requests.get(
+        response = self.session.get(
             f'{self.base_url}/debug/vars',
             headers=self.auth_headers
         )
@@ -233,10 +324,20 @@ class TestImitatus:
         assert 'items_count' in data
         assert 'recent_requests' in data
 
+    def test_debug_vars_pretty(self):
+        """Test indented output of the debug endpoint with pretty=1"""
+        response = self.session.get(f'{self.base_url}/debug/vars?pretty=1')
+        assert response.status_code == 200
+        assert '\n  "items_count"' in response.text
+        assert 'items_count' in response.json()
+
+        compact = self.session.get(f'{self.base_url}/debug/vars')
+        assert '\n' not in compact.text
+
     def test_nonexistent_endpoint(self):
         """Test accessing non-existent endpoint"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f'{self.base_url}/api/nonexistent',
                 headers=self.auth_headers
             )
@@ -247,6 +348,17 @@ class TestImitatus:
             # since we're testing for non-existent endpoint handling
             pass
 
+    def test_nested_item_path(self):
+        """Test that paths below /api/items/{id} are not routed to items"""
+        item_id = self.test_create_item()
+        response = self.session.put(
+            f'{self.base_url}/api/items/{item_id}/extra',
+            headers=self.auth_headers,
+            json={'name': 'Nested'}
+        )
+        assert response.status_code == 404
+        assert response.json()['error'] == 'Invalid endpoint'
+
     def test_complex_item_creation(self):
         """Test creating item with complex nested structure"""
         complex_item = {
@@ -261,7 +373,7 @@ class TestImitatus:
                 }
             }
         }
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/items',
             headers=self.auth_headers,
             json=complex_item
@@ -275,7 +387,7 @@ class TestImitatus:
 
     def test_malformed_json(self):
         """Test handling of malformed JSON in request body"""
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/items',
             headers={
                 **self.auth_headers,
@@ -288,11 +400,116 @@ class TestImitatus:
         assert 'error' in data
         assert 'Invalid JSON' in data['error']
 
+    def test_deeply_nested_json(self):
+        """Test that JSON nested beyond the parser's limits is rejected with 400"""
+        response = self.session.post(
+            f'{self.base_url}/api/items',
+            headers={
+                **self.auth_headers,
+                'Content-Type': 'application/json'
+            },
+            data='[' * 100000,
+        )
+        assert response.status_code == 400
+        assert 'Invalid JSON' in response.json()['error']
+
+    def test_null_json_body(self):
+        """Test that a JSON null body is answered at once on a kept-alive connection"""
+        for path in ('/api/login', '/api/items'):
+            response = self.session.post(
+                f'{self.base_url}{path}',
+                headers={
+                    **self.auth_headers,
+                    'Content-Type': 'application/json'
+                },
+                data='null',
+                timeout=5
+            )
+            assert response.status_code == 400
+            assert 'expected object' in response.json()['error']
+
+        # The connection stays usable for the next request
+        response = self.session.get(
+            f'{self.base_url}/api/items',
+            headers=self.auth_headers,
+            timeout=5
+        )
+        assert response.status_code == 200
+
+    def test_invalid_content_length(self):
+        """Test rejection of a non-numeric Content-Length header"""
+        with self.raw_connection() as conn:
+            conn.putrequest('POST', '/api/items')
+            conn.putheader('Authorization', f'Bearer {self.token}')
+            conn.putheader('Content-Length', 'abc')
+            conn.endheaders()
+            response = conn.getresponse()
+            assert response.status == 400
+            assert 'Content-Length' in json.loads(response.read())['error']
+
+    def test_keep_alive(self):
+        """Test that several requests are served over one connection"""
+        with self.raw_connection() as conn:
+            for _ in range(3):
+                conn.request('GET', '/api/items', headers=self.auth_headers)
+                response = conn.getresponse()
+                assert response.status == 200
+                assert response.version == 11
+                assert not response.will_close
+                response.read()
+
+    def test_unread_body_closes_connection(self):
+        """Test that a request rejected before its body is read closes the connection"""
+        with self.raw_connection() as conn:
+            conn.request('POST', '/api/items', body=json.dumps(self.test_item),
+                         headers=self.headers)  # No auth token
+            response = conn.getresponse()
+            assert response.status == 401
+            assert response.getheader('Connection') == 'close'
+            response.read()
+
+    def test_chunked_body_rejected(self):
+        """Test that a chunked request body is refused rather than silently dropped"""
+        with self.raw_connection() as conn:
+            # The server answers from the headers alone, before any chunk is sent
+            conn.putrequest('POST', '/api/items')
+            conn.putheader('Authorization', f'Bearer {self.token}')
+            conn.putheader('Transfer-Encoding', 'chunked')
+            conn.endheaders()
+            response = conn.getresponse()
+            assert response.status == 411
+            assert response.getheader('Connection') == 'close'
+            assert 'Content-Length' in json.loads(response.read())['error']
+
+    def test_expect_100_continue(self):
+        """Test that 100 Continue is sent before the client uploads the body"""
+        body = json.dumps(self.test_item).encode()
+        with self.raw_connection() as conn:
+            conn.connect()
+            conn.sock.settimeout(5)
+            conn.sock.sendall(
+                b"POST /api/items HTTP/1.1\r\n"
+                b"Host: localhost\r\n"
+                b"Authorization: Bearer " + self.token.encode() + b"\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Expect: 100-continue\r\n\r\n"
+            )
+            # The body has not been sent yet, so only the interim response can arrive
+            interim = conn.sock.recv(1024)
+            assert interim.startswith(b"HTTP/1.1 100 ")
+
+            conn.sock.sendall(body)
+            response = http.client.HTTPResponse(conn.sock)
+            response.begin()
+            assert response.status == 200
+            assert json.loads(response.read())['item']['name'] == self.test_item['name']
+
     def test_server_error_handling(self):
         """Test server error handling"""
         # Test with a large payload
         large_payload = {'data': 'x' * (5 * 1024 * 1024 + 1)}  # Just over 5MB
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/items',
             headers=self.auth_headers,
             json=large_payload
@@ -320,10 +537,10 @@ class TestImitatus:
     def test_request_logging(self):
         """Test that requests are being logged properly"""
         # Make a request
-        requests.get(f'{self.base_url}/debug/vars', headers=self.auth_headers)
+        self.session.get(f'{self.base_url}/debug/vars', headers=self.auth_headers)
 
         # Check the logs
-        response = requests.get(f'{self.base_url}/debug/vars', headers=self.auth_headers)
+        response = self.session.get(f'{self.base_url}/debug/vars', headers=self.auth_headers)
         data = response.json()
 
         assert 'recent_requests' in data